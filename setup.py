@@ -8,7 +8,7 @@ setup(
     description="A package for recording, storing, and replaying web interactions",
     packages=find_packages(),
     package_data={
-        "web_recorder": ["rrweb/*.js"],
+        "web_recorder": ["rrweb/*.js", "rrweb/*.css", "js/*.js"],
     },
     include_package_data=True,
 )
@@ -0,0 +1,67 @@
+import json
+import subprocess
+import sys
+
+from web_recorder.utils import load_asset
+
+# Upper bound for the cumulative import time of web_recorder, in microseconds.
+# It is roughly 9x the ~225ms measured without playwright / boto3, so this is a
+# smoke test against gross regressions rather than a precise benchmark.
+IMPORT_TIME_BUDGET_US = 2_000_000
+
+HEAVY_MODULES = ["playwright", "boto3", "botocore"]
+
+
+def import_web_recorder():
+    """Import web_recorder in a fresh interpreter with `-X importtime`"""
+    code = (
+        "import json, sys\n"
+        "import web_recorder\n"
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout), result.stderr
+
+
+def cumulative_import_time_us(importtime_output: str, module: str) -> int:
+    # lines look like "import time:  self [us] | cumulative | imported package"
+    for line in importtime_output.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+def test_import_does_not_load_heavy_dependencies():
+    loaded_modules, _ = import_web_recorder()
+
+    assert loaded_modules == []
+
+
+def test_import_time_benchmark():
+    _, importtime_output = import_web_recorder()
+
+    import_time_us = cumulative_import_time_us(importtime_output, "web_recorder")
+    assert (
+        import_time_us < IMPORT_TIME_BUDGET_US
+    ), f"import web_recorder took {import_time_us / 1000:.1f}ms"
+
+
+def test_load_asset_reads_bundled_files_once():
+    rrweb_js = load_asset("rrweb/rrweb.js")
+
+    assert rrweb_js
+    assert load_asset("rrweb/rrweb.js") is rrweb_js
+    for path in [
+        "rrweb/rrweb-player.js",
+        "rrweb/rrweb-stylesheet.css",
+        "rrweb/setup_recording.js",
+        "js/get_rrweb_dom_node.js",
+    ]:
+        assert load_asset(path)
@@ -0,0 +1,270 @@
+import pytest
+
+from web_recorder import Recording
+from web_recorder.utils import (
+    EVENT_SOURCES,
+    EVENT_TYPES,
+    RRWEB_SOURCES,
+    iter_snapshot_events,
+)
+
+
+def dom_content_loaded(timestamp):
+    return {"type": EVENT_TYPES["LOADED"], "timestamp": timestamp, "data": {}}
+
+
+def load(timestamp):
+    return {"type": EVENT_TYPES["INITAL_LOAD"], "timestamp": timestamp, "data": {}}
+
+
+def meta(timestamp, href="https://example.com"):
+    return {"type": EVENT_TYPES["META"], "timestamp": timestamp, "data": {"href": href}}
+
+
+def full_snapshot(timestamp):
+    return {"type": EVENT_TYPES["FULL_SNAPSHOT"], "timestamp": timestamp, "data": {}}
+
+
+def incremental(timestamp, source):
+    return {
+        "type": EVENT_TYPES["INCREMENTAL_SNAPSHOT"],
+        "timestamp": timestamp,
+        "data": {"source": source},
+    }
+
+
+def click(timestamp):
+    return incremental(timestamp, EVENT_SOURCES["MOUSE_INTERACTION"])
+
+
+def mutation(timestamp):
+    return incremental(timestamp, EVENT_SOURCES["MUTATION"])
+
+
+def page(timestamp, href="https://example.com"):
+    """The events rrweb emits when it starts recording a page"""
+    return [
+        dom_content_loaded(timestamp),
+        load(timestamp + 1),
+        meta(timestamp + 2, href),
+        full_snapshot(timestamp + 2),
+    ]
+
+
+def carried(event, timestamp):
+    return {**event, "timestamp": timestamp, "carried": True}
+
+
+def kinds(events):
+    return [(event["type"], event["data"].get("source")) for event in events]
+
+
+def assert_monotonic(events):
+    timestamps = [event["timestamp"] for event in events]
+    assert timestamps == sorted(timestamps)
+
+
+def assert_unique_event_keys(events):
+    # generate_dom_events dedupes on timestamp and type
+    keys = [(event["timestamp"], event["type"]) for event in events]
+    assert len(keys) == len(set(keys))
+
+
+def assert_replayable(events):
+    """The first events after the page load events are META and FULL_SNAPSHOT"""
+    load_types = [EVENT_TYPES["LOADED"], EVENT_TYPES["INITAL_LOAD"]]
+    page_events = [event for event in events if event["type"] not in load_types]
+    assert [event["type"] for event in page_events[:2]] == [
+        EVENT_TYPES["META"],
+        EVENT_TYPES["FULL_SNAPSHOT"],
+    ]
+
+
+def two_page_events():
+    return [
+        *page(0),
+        mutation(3),
+        incremental(4, EVENT_SOURCES["MOUSE_MOVE"]),
+        incremental(5, RRWEB_SOURCES["STYLE_SHEET_RULE"]),
+        incremental(6, EVENT_SOURCES["INPUT"]),
+        click(10),
+        mutation(12),
+        *page(20, "https://example.com/next"),
+        click(25),
+    ]
+
+
+def test_trim_prefixes_state_before_first_event():
+    recording = Recording(task_id="task", events=two_page_events())
+
+    trimmed = recording.trim(10, 15)
+
+    assert trimmed.events == [
+        carried(meta(2), 9),
+        carried(full_snapshot(2), 9),
+        carried(mutation(3), 9),
+        carried(incremental(5, RRWEB_SOURCES["STYLE_SHEET_RULE"]), 9),
+        carried(incremental(6, EVENT_SOURCES["INPUT"]), 9),
+        click(10),
+        mutation(12),
+    ]
+    assert_replayable(trimmed.events)
+    assert_monotonic(trimmed.events)
+    assert trimmed.task_id == "task"
+
+
+def test_trim_carried_events_are_not_trajectory_actions():
+    trimmed = Recording(task_id="task", events=two_page_events()).trim(10, 15)
+
+    assert list(iter_snapshot_events(trimmed.events)) == [click(10), mutation(12)]
+
+
+def test_trim_does_not_modify_original_events():
+    events = two_page_events()
+    Recording(task_id="task", events=events).trim(10, 15)
+
+    assert events == two_page_events()
+
+
+def test_trim_starting_on_page_load_needs_no_prefix():
+    trimmed = Recording(task_id="task", events=two_page_events()).trim(20, 30)
+
+    assert trimmed.events == [*page(20, "https://example.com/next"), click(25)]
+
+
+def test_trim_starting_on_full_snapshot_only_carries_meta():
+    events = [*page(0), mutation(3), full_snapshot(5), click(6)]
+
+    trimmed = Recording(task_id="task", events=events).trim(5, 6)
+
+    assert trimmed.events == [carried(meta(2), 4), full_snapshot(5), click(6)]
+
+
+def test_trim_stops_after_end():
+    events = two_page_events() + [{"type": EVENT_TYPES["CUSTOM"], "timestamp": 8}]
+
+    trimmed = Recording(task_id="task", events=events).trim(0, 12)
+
+    assert trimmed.events == two_page_events()[:10]
+
+
+def test_trim_window_without_events():
+    recording = Recording(task_id="task", events=two_page_events())
+
+    assert recording.trim(30, 40).events == []
+    assert recording.trim(13, 19).events == []
+    assert Recording(task_id="task", events=[]).trim(0, 10).events == []
+
+
+def test_split_on_navigation_starts_pieces_at_page_load_events():
+    events = two_page_events()
+
+    pieces = Recording(task_id="task", events=events).split_on_navigation()
+
+    assert [piece.events for piece in pieces] == [events[:10], events[10:]]
+    for piece in pieces:
+        assert piece.task_id == "task"
+        assert piece.events[:2] == [
+            dom_content_loaded(piece.events[0]["timestamp"]),
+            load(piece.events[0]["timestamp"] + 1),
+        ]
+        assert_replayable(piece.events)
+
+
+def test_split_on_navigation_of_trimmed_recording():
+    trimmed = Recording(task_id="task", events=two_page_events()).trim(10, 30)
+
+    pieces = trimmed.split_on_navigation()
+
+    assert [piece.events for piece in pieces] == [
+        trimmed.events[:7],
+        trimmed.events[7:],
+    ]
+    for piece in pieces:
+        assert_replayable(piece.events)
+
+
+def test_split_on_navigation_merges_page_without_full_snapshot():
+    events = [
+        *page(0),
+        mutation(3),
+        dom_content_loaded(20),
+        load(21),
+        meta(22, "https://example.com/next"),
+        click(25),
+    ]
+
+    pieces = Recording(task_id="task", events=events).split_on_navigation()
+
+    assert [piece.events for piece in pieces] == [events]
+
+
+def test_split_on_navigation_without_snapshot():
+    events = [dom_content_loaded(0), load(1), mutation(3)]
+
+    assert Recording(task_id="task", events=events).split_on_navigation() == []
+
+
+def test_split_on_navigation_empty():
+    assert Recording(task_id="task", events=[]).split_on_navigation() == []
+
+
+def test_concat_prefixes_reconnected_stream():
+    first = Recording(task_id="first", events=[*page(0), mutation(3)])
+    second = Recording(task_id="second", events=[click(10), mutation(11)])
+
+    joined = Recording.concat([first, second])
+
+    assert joined.task_id == "first"
+    assert joined.events == [
+        *first.events,
+        carried(meta(2), 9),
+        carried(full_snapshot(2), 9),
+        carried(mutation(3), 9),
+        *second.events,
+    ]
+    assert_monotonic(joined.events)
+    assert list(iter_snapshot_events(joined.events[4:])) == [
+        mutation(3),
+        click(10),
+        mutation(11),
+    ]
+
+
+def test_concat_shifts_overlapping_stream():
+    first = Recording(task_id="first", events=[*page(0), mutation(10)])
+    second = Recording(task_id="second", events=[mutation(5), click(8)])
+
+    joined = Recording.concat([first, second], task_id="joined")
+
+    assert joined.task_id == "joined"
+    # the shifted stream starts 2ms after the previous one, its prefix 1ms after
+    assert [event["timestamp"] for event in joined.events] == [
+        0,
+        1,
+        2,
+        2,
+        10,
+        11,
+        11,
+        11,
+        12,
+        15,
+    ]
+    assert joined.events[-2:] == [mutation(12), click(15)]
+    assert second.events == [mutation(5), click(8)]
+    assert_unique_event_keys(joined.events)
+
+
+def test_concat_stream_starting_with_page_load_is_not_prefixed():
+    first = Recording(task_id="first", events=[*page(0), mutation(3)])
+    second = Recording(task_id="second", events=page(10))
+
+    joined = Recording.concat([first, second])
+
+    assert joined.events == first.events + second.events
+
+
+def test_concat_requires_recordings():
+    with pytest.raises(ValueError):
+        Recording.concat([])
@@ -5,12 +5,16 @@ from typing import List, Dict, Optional
 from enum import Enum
 
 import uuid
-from playwright.async_api import async_playwright
 from pydantic import BaseModel
-import boto3
 
 from web_recorder.replayer import replay_events, build_trajectory_snapshots
-from web_recorder.utils import TrajectorySnapshot
+from web_recorder.utils import (
+    TrajectorySnapshot,
+    load_asset,
+    iter_concatenated_events,
+    iter_navigation_segments,
+    iter_trimmed_events,
+)
 
 no_automation_args = [
     "--no-sandbox",
@@ -38,6 +42,9 @@ class BrowserConfig(BaseModel):
 
 # potentially expose this to the users so they can pass in their own playwright browser that we can use, cdp or no cdp.
 async def create_browser(config: BrowserConfig):
+    # imported here so that reading / editing recordings doesn't load playwright
+    from playwright.async_api import async_playwright
+
     context_manager = async_playwright()
     p_instance = await context_manager.start()
     if config.cdp_url is None:
@@ -75,6 +82,8 @@ class Recording(BaseModel):
         )
 
     def __export_s3(self, path: str):
+        import boto3
+
         s3 = boto3.client("s3")
         # Always use jsonl format regardless of file extension
         key = path.replace("s3://", "")
@@ -152,9 +161,47 @@ class Recording(BaseModel):
 
         return trajectory_snapshots
 
+    def trim(self, start: int, end: int) -> "Recording":
+        """
+        Return a recording with only the events between the `start` and `end`
+        timestamps (inclusive), prefixed with the META / FULL_SNAPSHOT events
+        needed to replay it from `start`.
+        """
+        return Recording(
+            task_id=self.task_id,
+            events=list(iter_trimmed_events(self.events, start, end)),
+        )
+
+    def split_on_navigation(self) -> List["Recording"]:
+        """Split the recording into one replayable recording per page navigation"""
+        return [
+            Recording(task_id=self.task_id, events=events)
+            for events in iter_navigation_segments(self.events)
+        ]
+
+    @staticmethod
+    def concat(
+        recordings: List["Recording"], task_id: Optional[str] = None
+    ) -> "Recording":
+        """
+        Join recordings into a single replayable recording. The task id of the
+        first recording is used unless `task_id` is given.
+        """
+        if len(recordings) == 0:
+            raise ValueError("At least one recording is required to concat")
+
+        return Recording(
+            task_id=task_id or recordings[0].task_id,
+            events=list(
+                iter_concatenated_events(recording.events for recording in recordings)
+            ),
+        )
+
     @staticmethod
     def from_file(path: str):
         if path.startswith("s3://"):
+            import boto3
+
             s3 = boto3.client("s3")
             response = s3.get_object(Bucket="foundryml-trajectory", Key=path)
             content = response["Body"].read().decode("utf-8")
@@ -210,11 +257,11 @@ class Recorder:
             await context.expose_function("store_events", store_events)
 
             # Inject rrweb and recording scripts
-            await context.add_init_script(path="web_recorder/rrweb/rrweb.js")
+            await context.add_init_script(script=load_asset("rrweb/rrweb.js"))
             # custom code that injects task id and sets up recording
             await context.add_init_script(script=f"window.taskId = '{task_id}';")
             await context.add_init_script(
-                path="web_recorder/rrweb/setup_recording.js",
+                script=load_asset("rrweb/setup_recording.js"),
             )
             # Create new page
             page = await context.new_page()
@@ -1,15 +1,18 @@
 import asyncio
 import time
-
-from playwright.async_api import Page, Browser, BrowserContext
+from typing import TYPE_CHECKING
 
 from web_recorder.utils import (
     generate_dom_events,
     create_trajectory_snapshot,
+    load_asset,
 )
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Browser, BrowserContext
+
 
-async def setup_player(page: Page, events: list):
+async def setup_player(page: "Page", events: list):
     # check if player is already setup
     is_player_available = await page.evaluate("typeof player !== 'undefined'")
     if is_player_available:
@@ -39,16 +42,16 @@ async def setup_player(page: Page, events: list):
     return True
 
 
-async def inject_rrweb_player_js(context: BrowserContext):
-    await context.add_init_script(path="web_recorder/rrweb/rrweb.js")
-    await context.add_init_script(path="web_recorder/rrweb/rrweb-player.js")
+async def inject_rrweb_player_js(context: "BrowserContext"):
+    await context.add_init_script(script=load_asset("rrweb/rrweb.js"))
+    await context.add_init_script(script=load_asset("rrweb/rrweb-player.js"))
 
 
-async def inject_rrweb_player_css(page: Page):
-    await page.add_style_tag(path="web_recorder/rrweb/rrweb-stylesheet.css")
+async def inject_rrweb_player_css(page: "Page"):
+    await page.add_style_tag(content=load_asset("rrweb/rrweb-stylesheet.css"))
 
 
-async def replay_events(browser: Browser, events: list):
+async def replay_events(browser: "Browser", events: list):
     # fix event timestamps
     try:
         context = await browser.new_context(
@@ -92,7 +95,7 @@ async def replay_events(browser: Browser, events: list):
         print(f"Error replaying events: {e}")
 
 
-async def wait_for_player(page: Page, timeout: int = 30):
+async def wait_for_player(page: "Page", timeout: int = 30):
     """
     Wait for the rrweb player to be available.
     This is a helper function to wait for the player to be available before
@@ -122,7 +125,7 @@ async def wait_for_player(page: Page, timeout: int = 30):
             raise Exception("Player not available after timeout")
 
 
-async def build_trajectory_snapshots(browser: Browser, events: list):
+async def build_trajectory_snapshots(browser: "Browser", events: list):
     """Build the DOM for the events and generate trajectory snapshots"""
 
     # Create context and page
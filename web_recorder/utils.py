@@ -1,9 +1,13 @@
-from typing import Optional
+from functools import lru_cache
+from importlib.resources import files
+from typing import TYPE_CHECKING, Iterable, Optional
 from enum import Enum
 
-from playwright.async_api import Page
 from pydantic import BaseModel, ConfigDict
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
 # Event type constants
 # Refer to https://github.com/rrweb-io/rrweb/blob/master/docs/recipes/dive-into-event.md for more details
 EVENT_TYPES = {
@@ -30,12 +34,203 @@ EVENT_SOURCES = {
     "PAGE_LOAD": 9,
 }
 
+# The rest of rrweb's incremental sources. EVENT_SOURCES reuses 8 and 9 for the
+# NAVIGATION / PAGE_LOAD trajectory sources, so these are kept separate.
+RRWEB_SOURCES = {
+    "STYLE_SHEET_RULE": 8,
+    "CANVAS_MUTATION": 9,
+    "FONT": 10,
+    "LOG": 11,
+    "DRAG": 12,
+    "STYLE_DECLARATION": 13,
+    "SELECTION": 14,
+    "ADOPTED_STYLE_SHEET": 15,
+    "CUSTOM_ELEMENT": 16,
+}
+
 interactable_sources = [
     EVENT_SOURCES["INPUT"],
     EVENT_SOURCES["MOUSE_INTERACTION"],
     EVENT_SOURCES["MEDIA_INTERACTION"],
 ]
 
+# Incremental sources that don't change the page state: pointer, drag and
+# selection activity and console logs. Every other incremental event is carried
+# when a replay prefix is built.
+transient_sources = [
+    EVENT_SOURCES["MOUSE_MOVE"],
+    EVENT_SOURCES["MOUSE_INTERACTION"],
+    EVENT_SOURCES["TOUCH_MOVE"],
+    RRWEB_SOURCES["LOG"],
+    RRWEB_SOURCES["DRAG"],
+    RRWEB_SOURCES["SELECTION"],
+]
+
+
+@lru_cache(maxsize=None)
+def load_asset(path: str) -> str:
+    """Read a file bundled with the package (e.g. `rrweb/rrweb.js`), only once"""
+    return files("web_recorder").joinpath(path).read_text(encoding="utf-8")
+
+
+class ReplayState:
+    """
+    Tracks what the player needs to rebuild the page at the current point of an
+    event stream: the latest META event, the latest FULL_SNAPSHOT and the state
+    changing incremental events recorded since that snapshot.
+
+    The recorder doesn't take periodic checkouts, so a full snapshot is only
+    taken when a page loads: memory is bounded by the events of one page, not
+    by the size of the whole recording.
+    """
+
+    def __init__(self):
+        self.meta: Optional[dict] = None
+        self.full_snapshot: Optional[dict] = None
+        self.incremental: list[dict] = []
+
+    def update(self, event: dict):
+        event_type = event["type"]
+        if event_type == EVENT_TYPES["META"]:
+            self.meta = event
+        elif event_type == EVENT_TYPES["FULL_SNAPSHOT"]:
+            self.full_snapshot = event
+            self.incremental = []
+        elif (
+            event_type == EVENT_TYPES["INCREMENTAL_SNAPSHOT"]
+            and self.full_snapshot is not None
+            and event["data"].get("source") not in transient_sources
+        ):
+            self.incremental.append(event)
+
+    def prefix_for(self, event: dict) -> list[dict]:
+        """
+        Events to emit before `event` so that a stream starting at `event`
+        replays correctly. Carried events are copies, retimed to just before
+        `event` and marked with `carried` so that trajectory generation only
+        replays them instead of reporting them as actions.
+        """
+        event_type = event["type"]
+        # load events come right before the META / FULL_SNAPSHOT of a new page
+        if event_type in [
+            EVENT_TYPES["LOADED"],
+            EVENT_TYPES["INITAL_LOAD"],
+            EVENT_TYPES["META"],
+        ]:
+            return []
+
+        prefix = [self.meta]
+        if event_type != EVENT_TYPES["FULL_SNAPSHOT"]:
+            prefix.append(self.full_snapshot)
+            prefix.extend(self.incremental)
+
+        return [
+            {**prefix_event, "timestamp": event["timestamp"] - 1, "carried": True}
+            for prefix_event in prefix
+            if prefix_event is not None
+        ]
+
+
+def iter_trimmed_events(events: Iterable[dict], start: int, end: int):
+    """
+    Yield the events with `start <= timestamp <= end`, preceded by the
+    META / FULL_SNAPSHOT prefix needed to replay from `start`.
+
+    Events are expected in chronological order, iteration stops at the first
+    event past `end`.
+    """
+    state = ReplayState()
+    started = False
+    for event in events:
+        timestamp = event["timestamp"]
+        if timestamp > end:
+            break
+
+        if timestamp < start:
+            state.update(event)
+            continue
+
+        if not started:
+            started = True
+            yield from state.prefix_for(event)
+
+        yield event
+
+
+def iter_navigation_segments(events: Iterable[dict]):
+    """
+    Split an event stream into one list of events per page.
+
+    rrweb emits the LOADED / INITAL_LOAD events of a page before its META and
+    FULL_SNAPSHOT, so a segment starts at the load events that directly precede
+    a META. Events that can't be replayed on their own (no META or no
+    FULL_SNAPSHOT) are merged into the neighbouring segment, and a stream that
+    has neither yields nothing.
+    """
+    load_types = [EVENT_TYPES["LOADED"], EVENT_TYPES["INITAL_LOAD"]]
+    replayable_types = {EVENT_TYPES["META"], EVENT_TYPES["FULL_SNAPSHOT"]}
+
+    previous: Optional[list[dict]] = None
+    segment: list[dict] = []
+    segment_types: set[int] = set()
+    pending_loads: list[dict] = []
+    for event in events:
+        event_type = event["type"]
+        if event_type in load_types:
+            pending_loads.append(event)
+            continue
+
+        if event_type == EVENT_TYPES["META"] and replayable_types <= segment_types:
+            if previous is not None:
+                yield previous
+            previous, segment, segment_types = segment, [], set()
+
+        segment.extend(pending_loads)
+        pending_loads = []
+        segment.append(event)
+        segment_types.add(event_type)
+
+    segment.extend(pending_loads)
+    if replayable_types <= segment_types:
+        if previous is not None:
+            yield previous
+        yield segment
+    elif previous is not None:
+        yield previous + segment
+
+
+def iter_concatenated_events(event_streams: Iterable[Iterable[dict]]):
+    """
+    Chain several event streams (e.g. recordings from reconnects) into a single
+    replayable stream.
+
+    A stream that doesn't start with its own META / FULL_SNAPSHOT is prefixed
+    with the state carried from the previous streams, and a stream that starts
+    too close to the end of the previous one is shifted forward so that its
+    events, prefix included, come strictly after the previous stream.
+    """
+    state = ReplayState()
+    last_timestamp: Optional[int] = None
+    for events in event_streams:
+        offset = None
+        for event in events:
+            is_first = offset is None
+            if is_first:
+                offset = 0
+                if last_timestamp is not None:
+                    # leave room for the prefix, which sits 1ms before the event
+                    offset = max(0, last_timestamp + 2 - event["timestamp"])
+
+            if offset:
+                event = {**event, "timestamp": event["timestamp"] + offset}
+
+            if is_first:
+                yield from state.prefix_for(event)
+
+            state.update(event)
+            last_timestamp = event["timestamp"]
+            yield event
+
 
 class EventSnapshot(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True, extra="allow")
@@ -50,7 +245,7 @@ class EventSnapshot(BaseModel):
 
 
 async def generate_event_snapshots(
-    page: Page, event: dict, start_timestamp: int
+    page: "Page", event: dict, start_timestamp: int
 ) -> Optional[EventSnapshot]:
     """
     Generates a snapshot of the DOM state at a specific event timestamp during web recording replay.
@@ -135,9 +330,9 @@ async def generate_event_snapshots(
     if event_source in interactable_sources:
         node_id = event["data"].get("id", None)
         if node_id is not None:
-            with open("web_recorder/js/get_rrweb_dom_node.js", "r") as f:
-                js_code = f.read()
-            element = await page.evaluate(js_code, [node_id, event_source])
+            element = await page.evaluate(
+                load_asset("js/get_rrweb_dom_node.js"), [node_id, event_source]
+            )
 
     return EventSnapshot(
         timestamp=timestamp,
@@ -149,23 +344,36 @@ async def generate_event_snapshots(
     )
 
 
-async def generate_dom_events(page: Page, events: list) -> list[EventSnapshot]:
-    """Collect DOM snapshots for each event"""
-    dom_snapshots = []
-
-    start_timestamp = events[0]["timestamp"]
-
+def iter_snapshot_events(events: list):
+    """
+    Yield the events that get a DOM snapshot. Load events, duplicates of the
+    same timestamp and type, and events carried in by `ReplayState.prefix_for`
+    only rebuild the replayer state and are skipped.
+    """
     seen_events = set()
-    for i, event in enumerate(events):
-        event_key = f"{event['timestamp']}-{event['type']}"
-        if event_key in seen_events or event["type"] in [
+    for event in events:
+        if event.get("carried") or event["type"] in [
             EVENT_TYPES["LOADED"],
             EVENT_TYPES["INITAL_LOAD"],
         ]:
             continue
 
+        event_key = f"{event['timestamp']}-{event['type']}"
+        if event_key in seen_events:
+            continue
+
         seen_events.add(event_key)
 
+        yield event
+
+
+async def generate_dom_events(page: "Page", events: list) -> list[EventSnapshot]:
+    """Collect DOM snapshots for each event"""
+    dom_snapshots = []
+
+    start_timestamp = events[0]["timestamp"]
+
+    for event in iter_snapshot_events(events):
         snapshot = await generate_event_snapshots(page, event, start_timestamp)
 
         if snapshot is None: